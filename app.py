@@ -1,6 +1,10 @@
+import re
 import streamlit as st
 import pandas as pd
+import numpy as np
+from functools import partial
 from io import BytesIO
+from pandas.api.types import union_categoricals
 
 st.set_page_config(page_title="Reconciliation Dashboard", layout="wide")
 
@@ -28,13 +32,29 @@ if not seller_file or not vendor_file:
 # HELPERS
 # ─────────────────────────────────────────────
 
-def read_file(file) -> pd.DataFrame:
+def read_file(file_bytes: bytes, file_name: str) -> pd.DataFrame:
     """Read xlsx, xls, or csv into a raw DataFrame (no header)."""
-    name = file.name.lower()
-    if name.endswith(".csv"):
-        return pd.read_csv(file, header=None, dtype=str)
-    else:
-        return pd.read_excel(file, header=None, dtype=str)
+    with BytesIO(file_bytes) as buf:
+        if file_name.lower().endswith(".csv"):
+            raw = pd.read_csv(buf, header=None, dtype=str)
+        else:
+            raw = pd.read_excel(buf, header=None, dtype=str, engine="calamine")
+    # Arrow-backed strings from the start: every later strip / upper / compare
+    # runs on packed utf8 buffers instead of Python str objects
+    return raw.astype("string[pyarrow]")
+
+
+HEADER_KEYWORDS = [
+    "type", "voucher", "vch", "invoice", "bill",
+    "debit", "credit", "amount", "total", "date", "number", "no"
+]
+
+# One compiled pattern for all header keywords: the zero-width lookahead reports
+# every (overlapping) hit in a single scan of the row. No keyword is a prefix
+# of another, so no hit is shadowed by an earlier alternative.
+HEADER_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(kw) for kw in HEADER_KEYWORDS) + "))"
+)
 
 
 def detect_header_row(raw: pd.DataFrame) -> int:
@@ -42,16 +62,19 @@ def detect_header_row(raw: pd.DataFrame) -> int:
     Score each of the first 20 rows by how many financial keywords it contains.
     Return the row index with the highest score (minimum score of 2 required).
     """
-    KEYWORDS = [
-        "type", "voucher", "vch", "invoice", "bill",
-        "debit", "credit", "amount", "total", "date", "number", "no"
-    ]
-    best_row, best_score = 0, 0
-    for i in range(min(20, len(raw))):
-        row_str = " ".join(str(c).lower() for c in raw.iloc[i].values)
-        score = sum(1 for kw in KEYWORDS if kw in row_str)
-        if score > best_score:
-            best_score, best_row = score, i
+    # Join + lowercase each candidate row in one vectorized pass, then score
+    # rows by distinct keyword hits (argmax keeps the earliest best row)
+    head = raw.head(20)   # already string cells; NA → "nan" via na_rep
+    if head.empty:
+        best_row, best_score = 0, 0
+    else:
+        rows = head.iloc[:, 0].str.cat(head.iloc[:, 1:], sep=" ", na_rep="nan").str.lower()
+        # (row, hit) table of every keyword hit → distinct hits per row, no
+        # Python callback per row
+        hits = rows.str.extractall(HEADER_KEYWORD_RE)[0]
+        scores = hits.groupby(level=0).nunique().reindex(rows.index, fill_value=0).to_numpy()
+        best_row = int(np.argmax(scores))
+        best_score = int(scores[best_row])
     if best_score < 2:
         raise ValueError(
             f"Could not reliably detect a header row (best score={best_score}). "
@@ -60,12 +83,12 @@ def detect_header_row(raw: pd.DataFrame) -> int:
     return best_row
 
 
-def find_col(columns: list[str], priority_keywords: list[str]) -> str | None:
+def find_col(col_lower: dict[str, str], priority_keywords: list[str]) -> str | None:
     """
     Return the first column whose name contains any keyword,
     in priority order (earlier keywords win).
+    `col_lower` maps each column name to its pre-lowercased form.
     """
-    col_lower = {c: c.lower() for c in columns}
     for kw in priority_keywords:
         for col, low in col_lower.items():
             if kw in low:
@@ -85,9 +108,17 @@ CREDIT_KEYWORDS   = ["credit"]
 AMOUNT_KEYWORDS   = ["gross total", "gross amount", "invoice amount",
                      "taxable amount", "amount", "net amount", "total", "value"]
 
+STATUS_CATS = pd.CategoricalDtype([
+    "Matched", "Within Threshold", "Amount Mismatch",
+    "Missing in Seller Books", "Missing in Vendor Books",
+])
+
 
-def process_ledger(file, side_name: str) -> pd.DataFrame:
-    raw = read_file(file)
+# Cached per side so re-uploading only one file skips reprocessing the other;
+# bounded so old uploads don't pile up in server memory
+@st.cache_data(show_spinner=False, max_entries=4)
+def process_ledger(file_bytes: bytes, file_name: str, side_name: str) -> pd.DataFrame:
+    raw = read_file(file_bytes, file_name)
 
     try:
         header_row = detect_header_row(raw)
@@ -95,19 +126,20 @@ def process_ledger(file, side_name: str) -> pd.DataFrame:
         st.error(f"❌ {side_name}: {e}")
         st.stop()
 
-    df = pd.read_excel(file, header=header_row, dtype=str) \
-        if not file.name.lower().endswith(".csv") \
-        else pd.read_csv(file, header=header_row, dtype=str)
+    # Header names are stripped (and lowercased below) in one plain pass over
+    # the handful of labels — no Series/str-accessor round trip
+    cols = ["nan" if pd.isna(c) else str(c).strip() for c in raw.iloc[header_row].to_numpy()]
+    col_lower = {c: c.lower() for c in cols}   # lowercased once for every lookup
 
-    df.columns = df.columns.astype(str).str.strip()
-    cols = df.columns.tolist()
+    # Re-use the already-parsed cells instead of reading the file a second time
+    df = raw.iloc[header_row + 1:].set_axis(cols, axis=1)
 
     # ── Column detection ──────────────────────────────────
-    voucher_col = find_col(cols, VOUCHER_KEYWORDS)
-    invoice_col = find_col(cols, INVOICE_KEYWORDS)
-    debit_col   = find_col(cols, DEBIT_KEYWORDS)
-    credit_col  = find_col(cols, CREDIT_KEYWORDS)
-    amount_col  = find_col(cols, AMOUNT_KEYWORDS) if not (debit_col and credit_col) else None
+    voucher_col = find_col(col_lower, VOUCHER_KEYWORDS)
+    invoice_col = find_col(col_lower, INVOICE_KEYWORDS)
+    debit_col   = find_col(col_lower, DEBIT_KEYWORDS)
+    credit_col  = find_col(col_lower, CREDIT_KEYWORDS)
+    amount_col  = find_col(col_lower, AMOUNT_KEYWORDS) if not (debit_col and credit_col) else None
 
     if not voucher_col:
         st.error(f"❌ {side_name}: Voucher Type column not found. Detected columns: {cols}")
@@ -119,41 +151,64 @@ def process_ledger(file, side_name: str) -> pd.DataFrame:
         st.error(f"❌ {side_name}: No amount column found. Detected columns: {cols}")
         st.stop()
 
+    # Keep only the detected columns (first occurrence of each) so the
+    # cleaning and groupby below don't carry the rest of a wide export
+    needed = list(dict.fromkeys(
+        c for c in (voucher_col, invoice_col, debit_col, credit_col, amount_col) if c
+    ))
+    df = df.iloc[:, [cols.index(c) for c in needed]]
+
     # ── Clean & coerce ────────────────────────────────────
-    df["_invoice"]      = df[invoice_col].astype(str).str.strip()
-    df["_voucher_type"] = df[voucher_col].astype(str).str.strip()
+    # Invoice keys are normalised (trim + upper-case) in Arrow string kernels
+    # so stray spaces or mixed case don't turn one invoice into two. A blank
+    # voucher type stays a key ("") instead of an NA the groupby would drop.
+    df["_invoice"]      = df[invoice_col].astype("string[pyarrow]").str.strip().str.upper()
+    df["_voucher_type"] = df[voucher_col].astype("string[pyarrow]").str.strip().fillna("")
 
     # Drop blank / nan invoice rows
-    df = df[~df["_invoice"].str.lower().isin(["", "nan", "none", "null"])]
+    df = df[~df["_invoice"].fillna("").isin(["", "NAN", "NONE", "NULL"])]
 
+    # Net Debit − Credit per row first so the groupby only sums one column.
+    # Amounts land as plain float64 (blank/invalid → 0) whatever the parsed
+    # string backend inferred, so both sides merge and subtract the same way.
     if debit_col and credit_col:
-        df["_debit"]  = pd.to_numeric(df[debit_col],  errors="coerce").fillna(0)
-        df["_credit"] = pd.to_numeric(df[credit_col], errors="coerce").fillna(0)
-        grouped = (
-            df.groupby(["_invoice", "_voucher_type"], as_index=False)
-              .agg(_debit=("_debit", "sum"), _credit=("_credit", "sum"))
+        df["_amount"] = (
+            pd.to_numeric(df[debit_col],  errors="coerce").to_numpy(dtype="float64", na_value=0.0)
+            - pd.to_numeric(df[credit_col], errors="coerce").to_numpy(dtype="float64", na_value=0.0)
         )
-        grouped["Invoice_Amount"] = grouped["_debit"] - grouped["_credit"]
     else:
-        df["_amount"] = pd.to_numeric(df[amount_col], errors="coerce").fillna(0)
+        df["_amount"] = pd.to_numeric(df[amount_col], errors="coerce").to_numpy(dtype="float64", na_value=0.0)
+
+    # From here on only the cleaned key + net amount columns are needed
+    df = df[["_invoice", "_voucher_type", "_amount"]].rename(columns={"_amount": "Invoice_Amount"})
+
+    # Most SOAs list each invoice once — skip the groupby hash pass then
+    if df["_invoice"].is_unique:
+        grouped = df.reset_index(drop=True)
+    else:
         grouped = (
-            df.groupby(["_invoice", "_voucher_type"], as_index=False)
-              .agg(Invoice_Amount=("_amount", "sum"))
+            df.groupby(["_invoice", "_voucher_type"], as_index=False, sort=False, observed=True)
+              .agg(Invoice_Amount=("Invoice_Amount", "sum"))
         )
 
+    # Categorical keys let the merge hash int codes instead of strings
+    grouped["_invoice"]      = grouped["_invoice"].astype("category")
+    grouped["_voucher_type"] = grouped["_voucher_type"].astype("category")
+
     # Seller amounts are credits → make negative after aggregation
     if side_name == "Seller":
         grouped["Invoice_Amount"] = -grouped["Invoice_Amount"].abs()
 
+    # Keys share one name on both sides so the merge needs a single key pair
     grouped = grouped.rename(columns={
-        "_invoice":      f"{side_name}_Invoice_No",
-        "_voucher_type": f"{side_name}_Voucher_Type",
+        "_invoice":       "Invoice_No",
+        "_voucher_type":  "Voucher_Type",
         "Invoice_Amount": f"{side_name}_Invoice_Amount",
     })
 
     return grouped[[
-        f"{side_name}_Invoice_No",
-        f"{side_name}_Voucher_Type",
+        "Invoice_No",
+        "Voucher_Type",
         f"{side_name}_Invoice_Amount",
     ]]
 
@@ -162,41 +217,98 @@ def process_ledger(file, side_name: str) -> pd.DataFrame:
 # PROCESS & MERGE
 # ─────────────────────────────────────────────
 
-seller_df = process_ledger(seller_file, "Seller")
-vendor_df = process_ledger(vendor_file, "Vendor")
-
-recon_df = pd.merge(
-    seller_df,
-    vendor_df,
-    left_on  =["Seller_Invoice_No", "Seller_Voucher_Type"],
-    right_on =["Vendor_Invoice_No", "Vendor_Voucher_Type"],
-    how="outer",
-)
-
-# Accounting difference: seller (negative) + vendor (positive) should net to 0
-recon_df["Amount_Difference"] = (
-    recon_df["Seller_Invoice_Amount"].fillna(0)
-    + recon_df["Vendor_Invoice_Amount"].fillna(0)
-).abs()
-
-
-def get_status(row) -> str:
-    if pd.isna(row["Seller_Invoice_No"]):
-        return "Missing in Seller Books"
-    if pd.isna(row["Vendor_Invoice_No"]):
-        return "Missing in Vendor Books"
-    if row["Amount_Difference"] == 0:
-        return "Matched"
-    if row["Amount_Difference"] <= threshold:
-        return "Within Threshold"
-    return "Amount Mismatch"
+def pair_codes(df: pd.DataFrame, n_types: int) -> np.ndarray:
+    """Pack the (invoice, voucher type) category codes into one int64 per row."""
+    return (
+        df["Invoice_No"].cat.codes.to_numpy(dtype=np.int64) * n_types
+        + df["Voucher_Type"].cat.codes.to_numpy(dtype=np.int64)
+    )
 
 
-recon_df["Status"] = recon_df.apply(get_status, axis=1)
+@st.cache_data(show_spinner=False, max_entries=2)
+def reconcile(seller_bytes: bytes, seller_name: str,
+              vendor_bytes: bytes, vendor_name: str) -> pd.DataFrame:
+    """
+    Join both ledgers and compute Amount_Difference. Cached on the file
+    bytes, so a threshold change only re-runs the status selection below.
+    """
+    seller_df = process_ledger(seller_bytes, seller_name, "Seller")
+    vendor_df = process_ledger(vendor_bytes, vendor_name, "Vendor")
+
+    # Both sides must share one category dictionary per key for the codes to
+    # line up; the merge then joins purely on int codes (factorize-then-join)
+    for key in ["Invoice_No", "Voucher_Type"]:
+        key_cats = union_categoricals(
+            [seller_df[key], vendor_df[key]],
+            sort_categories=True,
+        ).categories
+        seller_df[key] = pd.Categorical(seller_df[key], categories=key_cats)
+        vendor_df[key] = pd.Categorical(vendor_df[key], categories=key_cats)
+
+    # Both keys are now codes into sorted category lists, so one int64 per
+    # (invoice, voucher type) pair sorts exactly like the pair itself. Indexing
+    # each side by that code in order turns the outer join into a linear
+    # sorted merge (no hash table); each side is already unique per pair.
+    n_types = len(seller_df["Voucher_Type"].cat.categories)
+
+    seller_keyed = (
+        seller_df.drop(columns=["Invoice_No", "Voucher_Type"])
+                 .set_index(pair_codes(seller_df, n_types))
+                 .sort_index()
+    )
+    vendor_keyed = (
+        vendor_df.drop(columns=["Invoice_No", "Voucher_Type"])
+                 .set_index(pair_codes(vendor_df, n_types))
+                 .sort_index()
+    )
 
-# Unified invoice / voucher columns for display
-recon_df["Invoice_No"]    = recon_df["Seller_Invoice_No"].fillna(recon_df["Vendor_Invoice_No"])
-recon_df["Voucher_Type"]  = recon_df["Seller_Voucher_Type"].fillna(recon_df["Vendor_Voucher_Type"])
+    # Each side should already be unique per pair; validate guards that, so a
+    # change upstream fails loudly instead of producing many-to-many rows
+    recon_df = seller_keyed.join(vendor_keyed, how="outer", validate="one_to_one")
+
+    # Rebuild the key columns from the joined pair codes
+    pairs = recon_df.index.to_numpy()
+    recon_df["Invoice_No"]   = pd.Categorical.from_codes(pairs // n_types, dtype=seller_df["Invoice_No"].dtype)
+    recon_df["Voucher_Type"] = pd.Categorical.from_codes(pairs % n_types, dtype=seller_df["Voucher_Type"].dtype)
+
+    # Accounting difference: seller (negative) + vendor (positive) should net to 0
+    seller_amt = recon_df["Seller_Invoice_Amount"].to_numpy(dtype="float64", na_value=0.0)
+    vendor_amt = recon_df["Vendor_Invoice_Amount"].to_numpy(dtype="float64", na_value=0.0)
+    diff = np.add(seller_amt, vendor_amt)
+    np.abs(diff, out=diff)   # in place — one temporary instead of two
+    recon_df["Amount_Difference"] = diff
+
+    return recon_df
+
+
+# getvalue() copies the upload; take that copy once per file and drop it as
+# soon as the (cached) reconciliation is built
+seller_bytes = seller_file.getvalue()
+vendor_bytes = vendor_file.getvalue()
+
+recon_df = reconcile(seller_bytes, seller_file.name, vendor_bytes, vendor_file.name)
+del seller_bytes, vendor_bytes
+
+diff = recon_df["Amount_Difference"].to_numpy()
+
+# Status is picked in priority order: missing sides first, then amount bands.
+# Aggregated amounts are never NaN, so a NaN amount marks the missing side.
+s_na = recon_df["Seller_Invoice_Amount"].isna().to_numpy()
+v_na = recon_df["Vendor_Invoice_Amount"].isna().to_numpy()
+
+# Select int8 codes (positions in STATUS_CATS) rather than strings — no label
+# array to build and no factorize pass when wrapping the result. Codes are
+# looked up by label, so reordering STATUS_CATS can't relabel statuses.
+status_code = STATUS_CATS.categories.get_loc
+conds   = [s_na, v_na, diff == 0, diff <= threshold]
+choices = [
+    status_code("Missing in Seller Books"),
+    status_code("Missing in Vendor Books"),
+    status_code("Matched"),
+    status_code("Within Threshold"),
+]
+codes = np.select(conds, choices, default=status_code("Amount Mismatch")).astype(np.int8)
+recon_df["Status"] = pd.Categorical.from_codes(codes, dtype=STATUS_CATS)
 
 final_df = recon_df[[
     "Invoice_No",
@@ -218,13 +330,20 @@ final_df.index.name = "S.No"
 st.divider()
 st.subheader("📌 Reconciliation Summary")
 
+# One bincount over the int8 Status codes gives every count (reused by the
+# Excel summary sheet)
+status_counts = dict(zip(
+    STATUS_CATS.categories,
+    np.bincount(final_df["Status"].cat.codes.to_numpy(), minlength=len(STATUS_CATS.categories)),
+))
+
 m1, m2, m3, m4, m5, m6 = st.columns(6)
 m1.metric("Total Invoices",        len(final_df))
-m2.metric("✅ Matched",             (final_df["Status"] == "Matched").sum())
-m3.metric("🟡 Within Threshold",    (final_df["Status"] == "Within Threshold").sum())
-m4.metric("🔴 Amount Mismatch",     (final_df["Status"] == "Amount Mismatch").sum())
-m5.metric("⚠️ Missing in Seller",   (final_df["Status"] == "Missing in Seller Books").sum())
-m6.metric("⚠️ Missing in Vendor",   (final_df["Status"] == "Missing in Vendor Books").sum())
+m2.metric("✅ Matched",             int(status_counts["Matched"]))
+m3.metric("🟡 Within Threshold",    int(status_counts["Within Threshold"]))
+m4.metric("🔴 Amount Mismatch",     int(status_counts["Amount Mismatch"]))
+m5.metric("⚠️ Missing in Seller",   int(status_counts["Missing in Seller Books"]))
+m6.metric("⚠️ Missing in Vendor",   int(status_counts["Missing in Vendor Books"]))
 
 st.metric(
     "💰 Total Unreconciled Difference (₹)",
@@ -243,55 +362,101 @@ selected_status = st.selectbox("Filter by status", status_options)
 
 search_query = st.text_input("🔍 Search by invoice number, voucher type or status", "")
 
-display_df = final_df.copy()
+# Matched rows rarely need inspecting; leave them out of "All" unless asked.
+# A search always sees every status so any single invoice can be looked up.
+hide_matched = st.checkbox("Hide matched invoices (ignored while searching)", value=True)
+
+display_df = final_df
 
 if selected_status != "All":
     display_df = display_df[display_df["Status"] == selected_status]
+elif hide_matched and not search_query:
+    display_df = display_df[display_df["Status"] != "Matched"]
 
 if search_query:
     q = search_query.lower()
+    # All three columns are string-valued categoricals, so .str works on them
+    # directly without an astype(str) copy first
     mask = (
-        display_df["Invoice_No"].astype(str).str.lower().str.contains(q, na=False)
-        | display_df["Voucher_Type"].astype(str).str.lower().str.contains(q, na=False)
-        | display_df["Status"].astype(str).str.lower().str.contains(q, na=False)
+        display_df["Invoice_No"].str.lower().str.contains(q, na=False)
+        | display_df["Voucher_Type"].str.lower().str.contains(q, na=False)
+        | display_df["Status"].str.lower().str.contains(q, na=False)
     )
     display_df = display_df[mask]
 
-st.caption(f"Showing {len(display_df)} of {len(final_df)} records")
-st.dataframe(display_df, use_container_width=True)
+# Every rerun ships the table to the browser — cap it unless asked for all.
+# The checkbox is always rendered (just disabled under the cap) with a fixed
+# label + key, so its tick survives filter/search changes.
+MAX_DISPLAY_ROWS = 10_000
+matching_rows = len(display_df)
+show_all = st.checkbox(
+    "Show all matching rows (may be slow)", value=False, key="show_all_rows",
+    disabled=matching_rows <= MAX_DISPLAY_ROWS,
+)
+if not show_all:
+    display_df = display_df.head(MAX_DISPLAY_ROWS)
+
+st.caption(
+    f"Showing {len(display_df):,} of {matching_rows:,} matching rows "
+    f"({len(final_df):,} records in total)"
+)
+# Arrow-backed columns let st.dataframe serialize without per-column
+# conversion; converting after filtering/capping only touches shown rows.
+# convert_integer=False keeps whole-rupee amounts as floats, so the amount
+# columns don't flip between integer and decimal display per filter.
+st.dataframe(
+    display_df.convert_dtypes(dtype_backend="pyarrow", convert_integer=False),
+    width="stretch",
+)
 
 # ─────────────────────────────────────────────
 # DOWNLOAD
 # ─────────────────────────────────────────────
 
-output = BytesIO()
-with pd.ExcelWriter(output, engine="openpyxl") as writer:
-    final_df.to_excel(writer, sheet_name="Reconciliation", index=True)
-
-    # Summary sheet
-    summary_data = {
-        "Metric": [
-            "Total Invoices", "Matched", "Within Threshold",
-            "Amount Mismatch", "Missing in Seller", "Missing in Vendor",
-            "Total Difference (₹)"
-        ],
-        "Value": [
-            len(final_df),
-            (final_df["Status"] == "Matched").sum(),
-            (final_df["Status"] == "Within Threshold").sum(),
-            (final_df["Status"] == "Amount Mismatch").sum(),
-            (final_df["Status"] == "Missing in Seller Books").sum(),
-            (final_df["Status"] == "Missing in Vendor Books").sum(),
-            round(final_df["Amount_Difference"].sum(), 2),
-        ]
-    }
-    pd.DataFrame(summary_data).to_excel(writer, sheet_name="Summary", index=False)
-
-output.seek(0)
+def build_report(df: pd.DataFrame, counts: dict, report_format: str) -> bytes:
+    """Serialize the reconciliation (plus a Summary sheet for .xlsx) to bytes."""
+    output = BytesIO()
+    if report_format == ".xlsx":
+        # xlsxwriter streams straight to the buffer. constant_memory is left off:
+        # pandas writes the body column by column, which that mode would drop.
+        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+            df.to_excel(writer, sheet_name="Reconciliation", index=True)
+
+            # Summary sheet
+            summary_data = {
+                "Metric": [
+                    "Total Invoices", "Matched", "Within Threshold",
+                    "Amount Mismatch", "Missing in Seller", "Missing in Vendor",
+                    "Total Difference (₹)"
+                ],
+                "Value": [
+                    len(df),
+                    int(counts["Matched"]),
+                    int(counts["Within Threshold"]),
+                    int(counts["Amount Mismatch"]),
+                    int(counts["Missing in Seller Books"]),
+                    int(counts["Missing in Vendor Books"]),
+                    round(df["Amount_Difference"].sum(), 2),
+                ]
+            }
+            pd.DataFrame(summary_data).to_excel(writer, sheet_name="Summary", index=False)
+    else:
+        df.to_csv(output, index=True, compression="gzip")
+    return output.getvalue()
+
+
+# Gzipped CSV is far quicker to build and download for very large results
+report_format = st.radio("Report format", [".xlsx", ".csv.gz"], horizontal=True)
+mime = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    if report_format == ".xlsx" else "application/gzip"
+)
 
+# Passing a callable defers building the file until the button is clicked,
+# instead of serializing the whole report on every rerun
 st.download_button(
-    label="⬇️ Download Full Report (.xlsx)",
-    data=output,
-    file_name="Reconciliation_Report.xlsx",
-    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    label=f"⬇️ Download Full Report ({report_format})",
+    data=partial(build_report, final_df, status_counts, report_format),
+    file_name=f"Reconciliation_Report{report_format}",
+    mime=mime,
 )